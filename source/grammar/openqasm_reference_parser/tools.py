@@ -2,6 +2,7 @@ import contextlib
 import io
 
 import antlr4
+from antlr4.tree.Tree import TerminalNodeImpl
 from antlr4.tree.Trees import Trees, ParseTree
 
 from . import Qasm3ParserError
@@ -44,27 +45,50 @@ def pretty_tree(*, program: str = None, file: str = None) -> str:
         lexer = qasm3Lexer(input_stream)
         token_stream = antlr4.CommonTokenStream(lexer)
         parser = qasm3Parser(token_stream)
-        tree = _pretty_tree_inner(parser.program(), parser.ruleNames, 0)
+        out = []
+        _pretty_tree_inner(parser.program(), parser.ruleNames, 0, out)
+        tree = "".join(out)
         error = err.getvalue()
     if error:
         raise Qasm3ParserError(f"Parse tree build failed. Error:\n{error}")
     return tree
 
 
-def _pretty_tree_inner(parse_tree: ParseTree, rule_names: list, level: int) -> str:
-    """Internal recursive routine used in pretty-printing the parse tree.
+def _pretty_tree_inner(
+    parse_tree: ParseTree, rule_names: list, level: int, out: list
+) -> None:
+    """Internal routine used in pretty-printing the parse tree.
+
+    The output is written as string fragments into ``out``, rather than being
+    returned, so that the whole tree is only joined into a single string once.
+    The tree is walked with an explicit stack instead of by recursion, because
+    long expressions and deeply nested blocks can produce parse trees deeper
+    than Python's recursion limit.
 
     Args:
-        parse_tree: a node in the parse tree of the output of the ANTLR parser.
+        parse_tree: the root node of the parse tree output by the ANTLR parser.
         rule_names: the ANTLR-generated list of rule names in the grammar.
-        level: the current indentation level.
-
-    Returns:
-        the pretty-printed tree starting from this node, indented correctly.
+        level: the indentation level of the root node.
+        out: the list of string fragments to append this node and its children
+            to, indented correctly.
     """
-    indent = "  " * level
-    tree = indent + Trees.getNodeText(parse_tree, rule_names) + "\n"
-    return tree + "".join(
-        _pretty_tree_inner(parse_tree.getChild(i), rule_names, level + 1)
-        for i in range(parse_tree.getChildCount())
-    )
+    append = out.append
+    get_node_text = Trees.getNodeText
+    stack = [(parse_tree, level)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, depth = pop()
+        append("  " * depth)
+        # Most of the nodes are leaf tokens, so handle them directly rather
+        # than going through the rule/error/terminal checks in
+        # `Trees.getNodeText`.  Error nodes are a subclass, so they still take
+        # the general path, as do terminals without a symbol.
+        if type(node) is TerminalNodeImpl and node.symbol is not None:
+            append(node.symbol.text)
+            append("\n")
+            continue
+        append(get_node_text(node, rule_names))
+        append("\n")
+        # Push the children in reverse, so they are popped in order.
+        for i in range(node.getChildCount() - 1, -1, -1):
+            push((node.getChild(i), depth + 1))
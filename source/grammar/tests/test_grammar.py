@@ -5,8 +5,12 @@ from typing import List, Union, Sequence
 
 import pytest
 import yaml
+from antlr4 import ParserRuleContext
+from antlr4.Token import CommonToken
+from antlr4.tree.Trees import Trees
 
 import openqasm_reference_parser
+from openqasm_reference_parser.tools import _pretty_tree_inner
 
 TEST_DIR = pathlib.Path(__file__).parent
 REPO_DIR = TEST_DIR.parents[2]
@@ -111,6 +115,45 @@ def test_reference_output(filename):
     assert parsed == obj["reference"]
 
 
+def test_deep_tree_pretty_prints():
+    """Test that a parse tree deeper than the recursion limit still prints.
+
+    ``additiveExpression`` is left-recursive, so a long sum is parsed into a
+    very deep tree without the parser itself recursing deeply.
+    """
+    program = "x = " + " + ".join(["1"] * 3000) + ";"
+    openqasm_reference_parser.pretty_tree(program=program)
+
+
+def test_pretty_tree_error_nodes_use_get_node_text(monkeypatch):
+    """Test that error nodes are not caught by the pretty-printer's fast path
+    for leaf tokens, and are still formatted by ``Trees.getNodeText``.
+    """
+
+    def token(text):
+        out = CommonToken()
+        out.text = text
+        return out
+
+    root = ParserRuleContext()
+    terminal = root.addTokenNode(token("x"))
+    error = root.addErrorNode(token("!"))
+
+    get_node_text = Trees.getNodeText
+    formatted = []
+
+    def recording_get_node_text(node, rule_names):
+        formatted.append(node)
+        return get_node_text(node, rule_names)
+
+    monkeypatch.setattr(Trees, "getNodeText", recording_get_node_text)
+    out = []
+    _pretty_tree_inner(root, ["program"], 0, out)
+    assert error in formatted
+    assert terminal not in formatted
+    assert "".join(out) == "program\n  x\n  !\n"
+
+
 @pytest.mark.parametrize(
     "filename",
     find_files(REPO_DIR / "examples", suffix=".qasm"),